@@ -10,17 +10,30 @@ The DevNomads API basically implements the PowerDNS API but applies client
 specific authentication and filtering.
 """
 
+import functools
 import json
 import logging
 from argparse import ArgumentParser
-from typing import List
+from typing import Any, Callable, List
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from lexicon.interfaces import Provider as BaseProvider
 
+# Optional dependency (lexicon[orjson] extra), used to parse large responses faster.
+try:
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+
+    json_loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 LOGGER = logging.getLogger(__name__)
 
+# Record types whose content is stored quoted by the API.
+QUOTED_RTYPES = frozenset({"TXT", "LOC"})
+
 
 class DevNomadsProviderError(Exception):
     """Generic DevNomads exception"""
@@ -41,9 +54,7 @@ class Provider(BaseProvider):
         super(Provider, self).__init__(config)
 
         self.api_endpoint = "https://api.devnomads.nl/services/dns"
-
-        if self.api_endpoint.endswith("/"):
-            self.api_endpoint = self.api_endpoint[:-1]
+        self._zone_url = "/zones/" + self._ensure_dot(self.domain)
 
         self.auth_token = self._get_provider_option("auth_token")
         if not self.auth_token:
@@ -53,12 +64,17 @@ class Provider(BaseProvider):
 
         self._zone_data = None
 
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+        self._session.headers["Authorization"] = f"Bearer {self.auth_token}"
+
+        self._fqdn_name_cached = functools.lru_cache(maxsize=1024)(self._fqdn_name)
+        self._full_name_cached = functools.lru_cache(maxsize=1024)(self._full_name)
+
     def zone_data(self):
         """Get zone data"""
         if self._zone_data is None:
-            self._zone_data = self._get(
-                "/zones/" + self._ensure_dot(self.domain)
-            ).json()
+            self._zone_data = json_loads(self._get(self._zone_url).content)
         return self._zone_data
 
     def authenticate(self):
@@ -66,7 +82,7 @@ class Provider(BaseProvider):
         self.domain_id = self.domain
 
     def cleanup(self) -> None:
-        pass
+        self._session.close()
 
     def _make_identifier(self, rtype, name, content):
         return f"{rtype}/{name}={content}"
@@ -80,50 +96,162 @@ class Provider(BaseProvider):
         return rtype, name, content
 
     def list_records(self, rtype=None, name=None, content=None):
+        # Bind the helpers used per record to locals, they are loop invariant.
+        fqdn_name = self._fqdn_name_cached
+        full_name = self._full_name_cached
+        unclean_content = self._unclean_content
+        make_identifier = self._make_identifier
+
+        target_name = fqdn_name(name) if name is not None else None
+        target_content = (
+            self._clean_content(rtype, content) if content is not None else None
+        )
+        rrsets = self.zone_data()["rrsets"]
+
         records = []
-        for rrset in self.zone_data()["rrsets"]:
-            if (
-                name is None or self._fqdn_name(rrset["name"]) == self._fqdn_name(name)
-            ) and (rtype is None or rrset["type"] == rtype):
+        records_append = records.append
+        for rrset in rrsets:
+            if (target_name is None or fqdn_name(rrset["name"]) == target_name) and (
+                rtype is None or rrset["type"] == rtype
+            ):
                 for record in rrset["records"]:
-                    if content is None or record["content"] == self._clean_content(
-                        rtype, content
-                    ):
-                        records.append(
+                    if target_content is None or record["content"] == target_content:
+                        records_append(
                             {
                                 "type": rrset["type"],
-                                "name": self._full_name(rrset["name"]),
+                                "name": full_name(rrset["name"]),
                                 "ttl": rrset["ttl"],
-                                "content": self._unclean_content(
+                                "content": unclean_content(
                                     rrset["type"], record["content"]
                                 ),
-                                "id": self._make_identifier(
+                                "id": make_identifier(
                                     rrset["type"], rrset["name"], record["content"]
                                 ),
                             }
                         )
-        LOGGER.debug(f"list_records: {records}")
+        LOGGER.debug("list_records: %s", records)
         return records
 
     def _clean_content(self, rtype, content):
-        if rtype in ("TXT", "LOC"):
-            if content[0] != '"':
-                content = '"' + content
-            if content[-1] != '"':
-                content += '"'
+        if rtype in QUOTED_RTYPES:
+            # A lone quote is both the opening and the closing one, it is not quoted.
+            if len(content) < 2 or not (
+                content.startswith('"') and content.endswith('"')
+            ):
+                content = '"' + content.removeprefix('"').removesuffix('"') + '"'
         elif rtype == "CNAME":
-            content = self._fqdn_name(content)
+            content = self._fqdn_name_cached(content)
         return content
 
     def _unclean_content(self, rtype, content):
-        if rtype in ("TXT", "LOC"):
-            content = content.strip('"')
+        if rtype in QUOTED_RTYPES:
+            content = content.removeprefix('"').removesuffix('"')
         elif rtype == "CNAME":
-            content = self._full_name(content)
+            content = self._full_name_cached(content)
         return content
 
     def create_record(self, rtype, name, content):
-        rname = self._fqdn_name(name)
+        updated_data = self._rrset_with_record(rtype, name, content)
+
+        self._patch_zone([updated_data])
+        return True
+
+    def delete_record(self, identifier=None, rtype=None, name=None, content=None):
+        if identifier is not None:
+            rtype, name, content = self._parse_identifier(identifier)
+
+        LOGGER.debug(f"delete {rtype} {name} {content}")
+        if rtype is None or name is None:
+            raise Exception("Must specify at least both rtype and name")
+
+        update_data = self._rrset_without_record(rtype, name, content)
+        if update_data is None:
+            return True
+
+        self._patch_zone([update_data])
+        return True
+
+    def update_record(self, identifier, rtype=None, name=None, content=None):
+        if identifier is None:
+            raise DevNomadsProviderError("Must specify the identifier of the record")
+
+        old_rtype, old_name, old_content = self._parse_identifier(identifier)
+        rtype = rtype or old_rtype
+        name = name or old_name
+        content = content if content is not None else old_content
+
+        # Removal and addition are sent in one PATCH. If the record stays in the
+        # same rrset, the addition is computed on top of the removal.
+        removed = self._rrset_without_record(old_rtype, old_name, old_content)
+        if (
+            removed is not None
+            and removed["type"] == rtype
+            and self._fqdn_name_cached(removed["name"]) == self._fqdn_name_cached(name)
+        ):
+            rrsets = [self._rrset_with_record(rtype, name, content, rrset=removed)]
+        else:
+            rrsets = [self._rrset_with_record(rtype, name, content)]
+            if removed is not None:
+                rrsets.insert(0, removed)
+
+        self._patch_zone(rrsets)
+        return True
+
+    def _patch_zone(self, rrsets):
+        """
+        Send the rrset changes to the API, then apply them to the cached zone data
+        so that it does not need to be fetched again.
+        """
+        request = {"rrsets": rrsets}
+        LOGGER.debug(f"request: {request}")
+
+        try:
+            self._patch(self._zone_url, data=request)
+        except requests.RequestException:
+            # The change may have been applied anyway, fetch the zone again next time.
+            self._zone_data = None
+            raise
+
+        if self._zone_data is None:
+            return
+        cached_rrsets = self._zone_data["rrsets"]
+        for change in rrsets:
+            index = self._find_rrset_index(change["type"], change["name"])
+            if change["changetype"] == "DELETE" or not change["records"]:
+                if index is not None:
+                    del cached_rrsets[index]
+                continue
+            rrset = {
+                "name": change["name"],
+                "type": change["type"],
+                "ttl": change["ttl"],
+                "records": [dict(record) for record in change["records"]],
+            }
+            if index is not None:
+                cached_rrsets[index] = rrset
+            else:
+                cached_rrsets.append(rrset)
+
+    def _find_rrset_index(self, rtype, name):
+        rname = self._fqdn_name_cached(name)
+        for index, rrset in enumerate(self.zone_data()["rrsets"]):
+            if (
+                rrset["type"] == rtype
+                and self._fqdn_name_cached(rrset["name"]) == rname
+            ):
+                return index
+        return None
+
+    def _find_rrset(self, rtype, name):
+        index = self._find_rrset_index(rtype, name)
+        return None if index is None else self.zone_data()["rrsets"][index]
+
+    def _rrset_with_record(self, rtype, name, content, rrset=None):
+        """
+        Build the rrset update adding the given record to the existing rrset,
+        which is looked up in the zone if not provided.
+        """
+        rname = self._fqdn_name_cached(name)
         newcontent = self._clean_content(rtype, content)
 
         updated_data = {
@@ -136,89 +264,56 @@ class Provider(BaseProvider):
 
         updated_data["records"].append({"content": newcontent, "disabled": False})
 
-        for rrset in self.zone_data()["rrsets"]:
-            if rrset["name"] == rname and rrset["type"] == rtype:
-                updated_data["ttl"] = rrset["ttl"]
+        if rrset is None:
+            rrset = self._find_rrset(rtype, rname)
+        if rrset is not None:
+            updated_data["ttl"] = rrset["ttl"]
 
-                for record in rrset["records"]:
-                    if record["content"] != newcontent:
-                        updated_data["records"].append(
-                            {
-                                "content": record["content"],
-                                "disabled": record["disabled"],
-                            }
-                        )
-                break
+            for record in rrset["records"]:
+                if record["content"] != newcontent:
+                    updated_data["records"].append(
+                        {
+                            "content": record["content"],
+                            "disabled": record["disabled"],
+                        }
+                    )
 
-        request = {"rrsets": [updated_data]}
-        LOGGER.debug(f"request: {requests}")
-
-        self._patch("/zones/" + self._ensure_dot(self.domain), data=request)
-        self._zone_data = None
-        return True
+        return updated_data
 
-    def delete_record(self, identifier=None, rtype=None, name=None, content=None):
-        if identifier is not None:
-            rtype, name, content = self._parse_identifier(identifier)
-
-        LOGGER.debug(f"delete {rtype} {name} {content}")
-        if rtype is None or name is None:
-            raise Exception("Must specify at least both rtype and name")
+    def _rrset_without_record(self, rtype, name, content=None):
+        """
+        Build the rrset update removing the given record (or all records if content
+        is None) from the existing rrset. Returns None if there is no such rrset.
+        """
+        rrset = self._find_rrset(rtype, name)
+        if rrset is None:
+            return None
 
-        for rrset in self.zone_data()["rrsets"]:
-            if rrset["type"] == rtype and self._fqdn_name(
-                rrset["name"]
-            ) == self._fqdn_name(name):
-                update_data = rrset
-
-                if "comments" in update_data:
-                    del update_data["comments"]
-
-                if content is None:
-                    update_data["records"] = []
-                    update_data["changetype"] = "DELETE"
-                else:
-                    new_record_list = []
-                    for record in update_data["records"]:
-                        if (
-                            self._clean_content(rrset["type"], content)
-                            != record["content"]
-                        ):
-                            new_record_list.append(record)
-
-                    update_data["records"] = new_record_list
-                    update_data["changetype"] = "REPLACE"
-                break
-
-        request = {"rrsets": [update_data]}
-        LOGGER.debug(f"request: {request}")
+        update_data = {key: value for key, value in rrset.items() if key != "comments"}
 
-        self._patch("/zones/" + self._ensure_dot(self.domain), data=request)
+        if content is None:
+            update_data["records"] = []
+            update_data["changetype"] = "DELETE"
+        else:
+            newcontent = self._clean_content(rrset["type"], content)
+            update_data["records"] = [
+                record for record in rrset["records"] if record["content"] != newcontent
+            ]
+            update_data["changetype"] = "REPLACE"
 
-        self._zone_data = None
-        return True
-
-    def update_record(self, identifier, rtype=None, name=None, content=None):
-        self.delete_record(identifier)
-        return self.create_record(rtype, name, content)
+        return update_data
 
     def _patch(self, url="/", data=None, query_params=None):
         return self._request("PATCH", url, data=data, query_params=query_params)
 
     def _request(self, action="GET", url="/", data=None, query_params=None):
-        if data is None:
-            data = {}
         if query_params is None:
             query_params = {}
-        response = requests.request(
+        response = self._session.request(
             action,
             self.api_endpoint + url,
             params=query_params,
-            data=json.dumps(data),
-            headers={
-                "Authorization": f"Bearer {self.auth_token}",
-                "Content-Type": "application/json",
-            },
+            json=data or None,
         )
         LOGGER.debug(f"response: {response.text}")
         response.raise_for_status()
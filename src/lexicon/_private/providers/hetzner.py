@@ -1,14 +1,24 @@
+import functools
 import json
 import logging
 from argparse import ArgumentParser
-from typing import Any, Optional, TypedDict, Union, cast
+from typing import Any, Callable, Optional, TypedDict, Union, cast
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from lexicon.config import ConfigResolver
 from lexicon.exceptions import AuthenticationError, LexiconError
 from lexicon.interfaces import Provider as BaseProvider
 
+# Optional dependency (lexicon[orjson] extra), used to parse large responses faster.
+try:
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+
+    json_loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 LOGGER = logging.getLogger(__name__)
 
 Record = TypedDict("Record", {"value": str})
@@ -61,9 +71,27 @@ class Provider(BaseProvider):
 
     def __init__(self, config: Union[ConfigResolver, dict[str, Any]]):
         super(Provider, self).__init__(config)
+        self._full_name_cached = functools.lru_cache(maxsize=1024)(self._full_name)
+        self._relative_name_cached = functools.lru_cache(maxsize=1024)(
+            self._relative_name
+        )
+        # Record sets of the zone, fetched once and reset on any change.
+        self._rrsets_cache: Optional[list[RecordSet]] = None
+        self._rrsets_by_id: dict[str, RecordSet] = {}
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+        self._session.headers["Authorization"] = (
+            f"Bearer {self._get_provider_option('auth_token')}"
+        )
 
     def authenticate(self) -> None:
         self.domain_id = self._fetch_zone(self.domain)["id"]
+        # The zone never changes for this provider instance, build its URLs once.
+        self._zone_url = f"/{self.domain_id}"
+        self._rrsets_url = self._zone_url + "/rrsets"
+
+    def cleanup(self) -> None:
+        self._session.close()
 
     def create_record(self, rtype: str, name: str, content: str) -> bool:
         duplicate_records = self.list_records(rtype, name, content)
@@ -72,7 +100,7 @@ class Provider(BaseProvider):
             return True
 
         self._post(
-            f"{self._rrset_url(name, rtype)}/actions/add_records",
+            self._rrset_url(name, rtype) + "/actions/add_records",
             cast(
                 dict[str, Any],
                 AddRecordsRequest(
@@ -88,15 +116,18 @@ class Provider(BaseProvider):
         name: Optional[str] = None,
         content: Optional[str] = None,
     ) -> list[dict[str, Any]]:
-        record_sets: list[RecordSet] = self._get(f"{self._zone_url()}/rrsets")["rrsets"]
-        name = self._full_name(name) if name else None
+        record_sets = self._fetch_rrsets()
+        target_name = self._full_name_cached(name) if name else None
+        # Filter on the record set first, so that records are only built for matches.
         return [
             record
             for record_set in record_sets
-            for record in self._rrset_to_records(record_set)
-            if (rtype is None or record["type"] == rtype)
-            and (name is None or record["name"] == name)
-            and (content is None or record["content"] == content)
+            if (rtype is None or record_set["type"] == rtype)
+            and (
+                target_name is None
+                or self._full_name_cached(record_set["name"]) == target_name
+            )
+            for record in self._rrset_to_records(record_set, content)
         ]
 
     def update_record(
@@ -147,7 +178,7 @@ class Provider(BaseProvider):
         else:
             # Record should be taken out of set
             self._post(
-                f"{self._rrset_url(name, rtype)}/actions/remove_records",
+                self._rrset_url(name, rtype) + "/actions/remove_records",
                 cast(
                     dict[str, Any],
                     RemoveRecordsRequest(
@@ -165,21 +196,20 @@ class Provider(BaseProvider):
         data: Optional[dict[str, Any]] = {},
         query_params: Optional[dict[str, Any]] = None,
     ):
-        data = data or {}
         query_params = query_params or {}
-        response = requests.request(
+        if action != "GET":
+            # Dropped before sending, a failed request may still have changed the zone.
+            self._rrsets_cache = None
+        response = self._session.request(
             action,
             self.API_ENDPOINT + url,
             params=query_params,
-            data=json.dumps(data),
-            headers={
-                "Authorization": f"Bearer {self._get_provider_option('auth_token')}",
-                "Content-Type": "application/json",
-            },
+            # Empty payloads are not sent, GET requests stay body-less.
+            json=data or None,
         )
         # if the request fails for any reason, throw an error.
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content)
 
     def _fetch_zone(self, domain: str) -> dict[str, Any]:
         try:
@@ -197,7 +227,7 @@ class Provider(BaseProvider):
         Hetzner record set (rrset) names have a different format.
         """
         if record_name.rstrip(".").endswith(domain):
-            return self._relative_name(record_name)
+            return self._relative_name_cached(record_name)
         return record_name
 
     def _move_record(
@@ -221,7 +251,7 @@ class Provider(BaseProvider):
 
     def _change_content(self, rtype: str, name: str, new_content: str):
         self._post(
-            f"{self._rrset_url(name, rtype)}/actions/set_records",
+            self._rrset_url(name, rtype) + "/actions/set_records",
             cast(
                 dict[str, Any],
                 SetRecordsRequest(records=[self._record_from(rtype, new_content)]),
@@ -232,40 +262,51 @@ class Provider(BaseProvider):
     def _find_record(
         self, identifier: str, content: Optional[str] = None
     ) -> Optional[dict[str, Any]]:
-        return next(
-            iter(
-                [
-                    record
-                    for record in self.list_records(content=content)
-                    if record["id"] == identifier
-                ]
-            )
-        )
+        self._fetch_rrsets()
+        rrset = self._rrsets_by_id.get(identifier)
+        if rrset is None:
+            return None
+        return next(iter(self._rrset_to_records(rrset, content)), None)
+
+    def _fetch_rrsets(self) -> list[RecordSet]:
+        if self._rrsets_cache is None:
+            self._rrsets_cache = self._get(self._rrsets_url)["rrsets"]
+            # Index built once per fetch, record set ids are unique within a zone.
+            self._rrsets_by_id = {rrset["id"]: rrset for rrset in self._rrsets_cache}
+        return self._rrsets_cache
 
     def _get_ttl(self) -> Optional[int]:
         return int(ttl) if (ttl := self._get_lexicon_option("ttl")) else None
 
-    def _zone_url(self) -> str:
-        return f"/{self.domain_id}"
-
     def _rrset_url(self, name: str, rtype: str) -> str:
         rrset_name = self._to_rrset_name(self.domain, name)
-        return f"{self._zone_url()}/rrsets/{rrset_name}/{rtype}"
+        return self._rrsets_url + "/" + rrset_name + "/" + rtype
 
-    def _rrset_to_records(self, rrset: RecordSet) -> list[dict[str, Any]]:
+    def _rrset_to_records(
+        self, rrset: RecordSet, content: Optional[str] = None
+    ) -> list[dict[str, Any]]:
+        name = self._full_name_cached(rrset["name"])
         return [
             {
                 "id": rrset["id"],
-                "name": self._full_name(rrset["name"]),
-                "content": record["value"]
-                if rrset["type"] != "TXT"
-                else record["value"].replace('""', " ").lstrip('"').rstrip('"'),
+                "name": name,
+                "content": value,
                 "type": rrset["type"],
                 "ttl": rrset["ttl"],
             }
-            for record in rrset["records"]
+            for value in (
+                self._value_to_content(rrset["type"], record["value"])
+                for record in rrset["records"]
+            )
+            if content is None or value == content
         ]
 
+    @staticmethod
+    def _value_to_content(rtype: str, value: str) -> str:
+        if rtype != "TXT":
+            return value
+        return value.replace('""', " ").removeprefix('"').removesuffix('"')
+
     @staticmethod
     def _record_from(rtype: str, content: str) -> Record:
         escaped_content = (
@@ -90,11 +90,12 @@ class Provider(BaseProvider):
         return filtered_records
 
     def _filter_records(self, records, rtype=None, name=None, content=None):
+        target_name = self._full_name(name) if name is not None else None
         return [
             record
             for record in records
             if (rtype is None or record["type"] == rtype)
-            and (name is None or record["name"] == self._full_name(name))
+            and (target_name is None or record["name"] == target_name)
             and (content is None or record["content"] == content)
         ]
 
@@ -5,14 +5,34 @@ Documentation to obtain an API key can be found in
 https://www.scaleway.com/en/developers/api/
 """
 
+import functools
 import json
+import logging
+import time
 from argparse import ArgumentParser
-from typing import List
+from typing import Any, Callable, List
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from lexicon.exceptions import LexiconError
 from lexicon.interfaces import Provider as BaseProvider
 
+# Optional dependency (lexicon[orjson] extra), used to encode and parse JSON faster.
+try:
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+
+    json_dumps: Callable[[Any], bytes] = orjson.dumps
+    json_loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    json_loads = json.loads
+
+LOGGER = logging.getLogger(__name__)
+
 
 class Provider(BaseProvider):
     """
@@ -29,15 +49,45 @@ class Provider(BaseProvider):
             "--auth-secret-key",
             help="specify Scaleway API key",
         )
+        parser.add_argument(
+            "--cache-ttl",
+            help="specify for how many seconds the zone records are cached "
+            "between operations, 0 to disable (default: 30)",
+        )
 
     def __init__(self, config):
         super(Provider, self).__init__(config)
         self.default_ttl = 3600
         self.endpoint = "https://api.scaleway.com/domain/v2beta1"
+        self._full_name_cached = functools.lru_cache(maxsize=256)(self._full_name)
+        # Records of the zone, fetched once and reset on any change or after cache_ttl.
+        cache_ttl = self._get_provider_option("cache_ttl")
+        try:
+            self._records_cache_ttl = int(cache_ttl) if cache_ttl is not None else 30
+        except ValueError:
+            raise LexiconError(
+                f"Invalid cache_ttl {cache_ttl!r}, expected a number of seconds"
+            ) from None
+        self._records_cache = None
+        self._records_cache_time = 0.0
+        self._records_index = {}
+        self._records_by_name = {}
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+        self._session.headers.update(
+            {
+                "Accept": "application/json",
+                "X-Auth-Token": self._get_provider_option("auth_secret_key"),
+            }
+        )
 
     def authenticate(self):
         self.domain_id = self.domain.lower()
-        self._get(self._records_url())
+        self._records_url = f"/dns-zones/{self.domain_id}/records"
+        self._get_records(force=True)
+
+    def cleanup(self) -> None:
+        self._session.close()
 
     def create_record(self, rtype, name, content):
         records = self.list_records(rtype, name, content)
@@ -60,78 +110,101 @@ class Provider(BaseProvider):
                 },
             ],
         }
-        self._patch(self._records_url(), patch)
+        self._patch(self._records_url, patch)
         return True
 
     def list_records(self, rtype=None, name=None, content=None):
-        results = self._get(self._records_url())
-        records = []
-        for result in results["records"]:
-            record = {
-                "id": result["id"],
-                "type": result["type"],
-                "name": self._full_name(result["name"]),
-                "ttl": result["ttl"],
-                "content": self._decode_content(result["type"], result["data"]),
-            }
-            records.append(record)
-        return self._filter_records(records, rtype, name, content)
+        records = self._get_records()
+        type_filter = rtype
+        if name:
+            # The indexes already match the name, and the type if given.
+            full_name = self._full_name_cached(name)
+            if rtype:
+                records = self._records_index.get((rtype, full_name), [])
+            else:
+                records = self._records_by_name.get(full_name, [])
+            type_filter = None
+        # Return copies, the cached records and indexes must not be changed by callers.
+        return [
+            dict(record)
+            for record in self._filter_records(records, type_filter, content=content)
+        ]
+
+    def _get_records(self, force=False):
+        now = time.monotonic()
+        if (
+            force
+            or self._records_cache is None
+            or now - self._records_cache_time >= self._records_cache_ttl
+        ):
+            results = self._get(self._records_url)
+            full_name = self._full_name_cached
+            decode_content = self._decode_content
+            records = [
+                {
+                    "id": result["id"],
+                    "type": result["type"],
+                    "name": full_name(result["name"]),
+                    "ttl": result["ttl"],
+                    "content": decode_content(result["type"], result["data"]),
+                }
+                for result in results["records"]
+            ]
+            self._records_cache = records
+            self._records_cache_time = now
+            self._records_index = {}
+            self._records_by_name = {}
+            for record in records:
+                self._records_index.setdefault(
+                    (record["type"], record["name"]), []
+                ).append(record)
+                self._records_by_name.setdefault(record["name"], []).append(record)
+        return self._records_cache
 
     @staticmethod
     def _decode_content(rtype, data):
         if not data or rtype != "TXT":
             return data
-        if data[0] == '"' and data[len(data) - 1] == '"':
-            return (
-                data[1:-1].replace('" "', "").replace('\\"', '"').replace("\\\\", "\\")
-            )
+        if data.startswith('"') and data.endswith('"'):
+            data = data[1:-1].replace('" "', "")
+            # Most TXT values contain no escape sequence, skip the unescaping then.
+            if "\\" in data:
+                data = data.replace('\\"', '"').replace("\\\\", "\\")
         return data
 
-    def _filter_records(self, records, rtype=None, name=None, content=None):
-        if not rtype and not name and not content:
+    def _filter_records(self, records, rtype=None, content=None):
+        if not rtype and not content:
             return records
 
         filtered = []
         for record in records:
             if rtype and record["type"] != rtype:
                 continue
-            if name and record["name"] != self._full_name(name):
-                continue
             if content and record["content"] != content:
                 continue
             filtered.append(record)
         return filtered
 
     def delete_record(self, identifier=None, rtype=None, name=None, content=None):
-        changes = []
         if identifier:
-            changes.append(
-                {
-                    "delete": {
-                        "id": identifier,
-                    },
-                }
-            )
-        else:
-            records = self.list_records(rtype, name, content)
-            if not records:
-                return True
-            for record in records:
-                changes.append(
-                    {
-                        "delete": {
-                            "id": record["id"],
-                        },
-                    }
-                )
+            return self._delete_records([identifier])
+        records = self.list_records(rtype, name, content)
+        return self._delete_records(record["id"] for record in records)
+
+    def _delete_records(self, identifiers):
+        """Delete all records with the given ids in one PATCH request"""
+        changes = [{"delete": {"id": identifier}} for identifier in identifiers]
+        if not changes:
+            return True
         patch = {
             "changes": changes,
         }
-        self._patch(self._records_url(), patch)
+        self._patch(self._records_url, patch)
         return True
 
     def update_record(self, identifier=None, rtype=None, name=None, content=None):
         if not identifier:
+            # Served from the cached records and their name index when still fresh.
             records = self.list_records(None, name)
             if not records:
                 raise Exception(f"Record {name} not found with type {rtype}")
@@ -156,25 +229,35 @@ class Provider(BaseProvider):
                 },
             ],
         }
-        print(patch)
-        self._patch(self._records_url(), patch)
+        LOGGER.debug("update_record patch: %s", patch)
+        self._patch(self._records_url, patch)
         return True
 
-    def _request(self, action="GET", url="/", data=None, query_params=None):
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "X-Auth-Token": self._get_provider_option("auth_secret_key"),
-        }
-        response = requests.request(
+    def _patch(self, url="/", data=None, query_params=None):
+        # Callers never use the body of PATCH responses, skip its decoding.
+        return self._request(
+            "PATCH", url, data=data, query_params=query_params, decode=False
+        )
+
+    def _request(
+        self, action="GET", url="/", data=None, query_params=None, decode=True
+    ):
+        headers = {}
+        body = None
+        if data is not None:
+            headers["Content-Type"] = "application/json"
+            body = json_dumps(data)
+        if action != "GET":
+            # Dropped before sending, a failed request may still have changed the zone.
+            self._records_cache = None
+        response = self._session.request(
             action,
             self.endpoint + url,
             params=query_params,
-            data=json.dumps(data),
+            data=body,
             headers=headers,
         )
         response.raise_for_status()
-        return response.json()
-
-    def _records_url(self):
-        return f"/dns-zones/{self.domain_id}/records"
+        if not decode:
+            return None
+        return json_loads(response.content)
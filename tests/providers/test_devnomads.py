@@ -1,10 +1,30 @@
 """Integration tests for DevNomads"""
 
+import json
 from unittest import TestCase
+from unittest.mock import Mock
 
 import pytest
+import requests
 from integration_tests import IntegrationTestsV2
 
+from lexicon._private.providers.devnomads import Provider
+from lexicon.config import ConfigResolver
+
+ZONE = {
+    "rrsets": [
+        {
+            "name": "_acme.example.nl.",
+            "type": "TXT",
+            "ttl": 300,
+            "records": [
+                {"content": '"old"', "disabled": False},
+                {"content": '"other"', "disabled": False},
+            ],
+        },
+    ],
+}
+
 
 # Hook into testing framework by inheriting unittest.TestCase and reuse
 # the tests which *each and every* implementation of the interface must
@@ -23,3 +43,89 @@ class DevNomadsProviderTests(TestCase, IntegrationTestsV2):
         self,
     ):
         return
+
+
+@pytest.fixture
+def make_provider():
+    """Build authenticated providers whose mocked session serves the given zone."""
+
+    def _make_provider(zone):
+        config = ConfigResolver().with_dict(
+            {
+                "provider_name": "devnomads",
+                "domain": "example.nl",
+                "devnomads": {"auth_token": "token"},
+            }
+        )
+        provider = Provider(config)
+        provider._session = Mock()
+        provider._session.request.return_value = Mock(
+            content=json.dumps(zone).encode("utf-8")
+        )
+        provider.authenticate()
+        provider._session.request.reset_mock()
+        return provider
+
+    return _make_provider
+
+
+def test_clean_content_quotes_txt_content(make_provider):
+    """Tests that TXT content is quoted exactly once, including empty content."""
+    provider = make_provider(ZONE)
+    assert provider._clean_content("TXT", "") == '""'
+    assert provider._clean_content("TXT", '"') == '""'
+    assert provider._clean_content("TXT", '""') == '""'
+    assert provider._clean_content("TXT", "value") == '"value"'
+    assert provider._clean_content("TXT", '"value') == '"value"'
+    assert provider._clean_content("TXT", 'value"') == '"value"'
+    assert provider._clean_content("TXT", '"value"') == '"value"'
+    assert provider._clean_content("A", "") == ""
+
+
+def test_update_record_sends_one_patch_and_updates_cached_zone(make_provider):
+    """Tests the PATCH payload of an update, and the cached zone afterwards."""
+    provider = make_provider(ZONE)
+
+    provider.update_record('TXT/_acme.example.nl.="old"', content="new")
+
+    provider._session.request.assert_called_once()
+    args, kwargs = provider._session.request.call_args
+    assert args == ("PATCH", "https://api.devnomads.nl/services/dns/zones/example.nl.")
+    assert kwargs["json"] == {
+        "rrsets": [
+            {
+                "name": "_acme.example.nl.",
+                "type": "TXT",
+                "ttl": 300,
+                "records": [
+                    {"content": '"new"', "disabled": False},
+                    {"content": '"other"', "disabled": False},
+                ],
+                "changetype": "REPLACE",
+            },
+        ],
+    }
+    assert provider.zone_data()["rrsets"] == [
+        {
+            "name": "_acme.example.nl.",
+            "type": "TXT",
+            "ttl": 300,
+            "records": [
+                {"content": '"new"', "disabled": False},
+                {"content": '"other"', "disabled": False},
+            ],
+        },
+    ]
+    # The cached zone is used, no GET is sent.
+    provider._session.request.assert_called_once()
+
+
+def test_patch_failure_drops_cached_zone(make_provider):
+    """Tests that the cached zone is dropped when a PATCH fails in any way."""
+    provider = make_provider(ZONE)
+    provider._session.request.side_effect = requests.ConnectionError()
+
+    with pytest.raises(requests.ConnectionError):
+        provider.delete_record(rtype="TXT", name="_acme", content="old")
+
+    assert provider._zone_data is None
@@ -1,7 +1,25 @@
+import json
 from unittest import TestCase
+from unittest.mock import Mock
 
+import pytest
+import requests
 from integration_tests import IntegrationTestsV2
 
+from lexicon._private.providers.hetzner import Provider
+from lexicon.config import ConfigResolver
+from lexicon.exceptions import LexiconError
+
+RRSETS = [
+    {
+        "id": "www/A",
+        "name": "www",
+        "type": "A",
+        "ttl": 3600,
+        "records": [{"value": "1.2.3.4"}],
+    },
+]
+
 
 class HetznerProviderTests(TestCase, IntegrationTestsV2):
     provider_name = "hetzner"
@@ -9,3 +27,75 @@ class HetznerProviderTests(TestCase, IntegrationTestsV2):
 
     def _filter_headers(self):
         return ["Authorization"]
+
+
+@pytest.fixture
+def make_provider():
+    """Build authenticated providers whose mocked session serves the given rrsets."""
+
+    def _make_provider(rrsets):
+        config = ConfigResolver().with_dict(
+            {
+                "provider_name": "hetzner",
+                "domain": "example.com",
+                "hetzner": {"auth_token": "token"},
+            }
+        )
+        provider = Provider(config)
+
+        def request(action, url, **kwargs):
+            if url.endswith("/rrsets"):
+                payload = {"rrsets": rrsets}
+            else:
+                payload = {"zone": {"id": "1"}}
+            return Mock(content=json.dumps(payload).encode("utf-8"))
+
+        provider._session = Mock()
+        provider._session.request.side_effect = request
+        provider.authenticate()
+        provider._session.request.reset_mock()
+        return provider
+
+    return _make_provider
+
+
+def _methods(provider):
+    return [call.args[0] for call in provider._session.request.call_args_list]
+
+
+def test_delete_record_with_unknown_identifier_should_fail(make_provider):
+    """Tests that deleting a record with an unknown identifier raises a LexiconError."""
+    provider = make_provider(RRSETS)
+
+    with pytest.raises(LexiconError):
+        provider.delete_record(identifier="unknown")
+
+
+def test_list_records_reuses_the_fetched_rrsets(make_provider):
+    """Tests that the rrsets are fetched once for successive reads."""
+    provider = make_provider(RRSETS)
+
+    provider.list_records()
+    provider.list_records("A", "www")
+    assert _methods(provider) == ["GET"]
+
+
+def test_rrsets_are_fetched_again_after_a_change(make_provider):
+    """Tests that a POST drops the fetched rrsets."""
+    provider = make_provider(RRSETS)
+
+    provider.create_record("A", "new", "5.6.7.8")
+    provider.list_records()
+    assert _methods(provider) == ["GET", "POST", "GET"]
+
+
+def test_rrsets_are_fetched_again_after_a_failed_change(make_provider):
+    """Tests that a POST failing to complete drops the fetched rrsets too."""
+    provider = make_provider(RRSETS)
+    provider.list_records()
+    provider._session.request.side_effect = requests.ConnectionError()
+
+    with pytest.raises(requests.ConnectionError):
+        provider.create_record("A", "new", "5.6.7.8")
+
+    assert provider._rrsets_cache is None
@@ -1,9 +1,24 @@
 """Integration tests for the Scaleway API provider"""
 
+import json
 from unittest import TestCase
+from unittest.mock import Mock, patch
 
+import pytest
+import requests
 from integration_tests import IntegrationTestsV2, vcr_integration_test
 
+from lexicon._private.providers.scaleway import Provider
+from lexicon.config import ConfigResolver
+from lexicon.exceptions import LexiconError
+
+RECORDS = {
+    "records": [
+        {"id": "1", "type": "A", "name": "www", "ttl": 3600, "data": "1.2.3.4"},
+        {"id": "2", "type": "TXT", "name": "www", "ttl": 3600, "data": '"txt"'},
+    ],
+}
+
 
 class ScalewayProviderTests(TestCase, IntegrationTestsV2):
     """Integration tests for Scaleway provider"""
@@ -14,6 +29,9 @@ class ScalewayProviderTests(TestCase, IntegrationTestsV2):
     def _filter_headers(self):
         return ["X-Auth-Token"]
 
+    def _test_parameters_overrides(self):
+        return {"cache_ttl": "30"}
+
     @vcr_integration_test
     def test_provider_when_calling_list_records_should_return_empty_list_if_no_records_found(
         self,
@@ -25,3 +43,118 @@ class ScalewayProviderTests(TestCase, IntegrationTestsV2):
     def test_provider_when_calling_list_records_with_arguments_should_filter_list(self):
         provider = self._construct_authenticated_provider()
         assert isinstance(provider.list_records(), list)
+
+
+@pytest.fixture
+def make_provider():
+    """Build authenticated providers whose mocked session serves the given records."""
+
+    def _make_provider(records, cache_ttl="30"):
+        config = ConfigResolver().with_dict(
+            {
+                "provider_name": "scaleway",
+                "domain": "example.com",
+                "scaleway": {"auth_secret_key": "key", "cache_ttl": cache_ttl},
+            }
+        )
+        provider = Provider(config)
+        provider._session = Mock()
+        provider._session.request.return_value = Mock(
+            content=json.dumps(records).encode("utf-8")
+        )
+        provider.authenticate()
+        provider._session.request.reset_mock()
+        return provider
+
+    return _make_provider
+
+
+def test_list_records_returns_copies_of_the_cached_records(make_provider):
+    """Tests that changing listed records does not change the cached ones."""
+    provider = make_provider(RECORDS)
+
+    records = provider.list_records()
+    records[0]["name"] = "mutated"
+    records.clear()
+
+    assert [record["name"] for record in provider.list_records()] == [
+        "www.example.com",
+        "www.example.com",
+    ]
+    provider._session.request.assert_not_called()
+
+
+def test_list_records_by_name_returns_copies_of_the_indexed_records(make_provider):
+    """Tests that changing records listed from an index does not change it."""
+    provider = make_provider(RECORDS)
+
+    records = provider.list_records("A", "www")
+    records[0]["content"] = "mutated"
+    provider.list_records(name="www").clear()
+
+    assert provider.list_records("A", "www") == [
+        {
+            "id": "1",
+            "type": "A",
+            "name": "www.example.com",
+            "ttl": 3600,
+            "content": "1.2.3.4",
+        },
+    ]
+    assert len(provider.list_records(name="www")) == 2
+
+
+@patch("lexicon._private.providers.scaleway.time.monotonic", return_value=100.0)
+def test_records_cache_expires_after_cache_ttl(monotonic, make_provider):
+    """Tests that cached records are fetched again once cache_ttl is elapsed."""
+    provider = make_provider(RECORDS, cache_ttl="30")
+
+    monotonic.return_value = 129.0
+    provider.list_records()
+    provider._session.request.assert_not_called()
+
+    monotonic.return_value = 130.0
+    provider.list_records()
+    provider.list_records()
+    provider._session.request.assert_called_once()
+    assert provider._session.request.call_args[0][0] == "GET"
+
+
+@patch("lexicon._private.providers.scaleway.time.monotonic", return_value=100.0)
+def test_records_cache_is_disabled_with_zero_cache_ttl(monotonic, make_provider):
+    """Tests that records are fetched on every call when cache_ttl is 0."""
+    provider = make_provider(RECORDS, cache_ttl="0")
+
+    provider.list_records()
+    provider.list_records()
+    assert provider._session.request.call_count == 2
+
+
+@patch("lexicon._private.providers.scaleway.time.monotonic", return_value=100.0)
+def test_records_cache_is_reset_after_a_patch(monotonic, make_provider):
+    """Tests that records are fetched again after a change, even within cache_ttl."""
+    provider = make_provider(RECORDS, cache_ttl="30")
+
+    provider.create_record("A", "new", "5.6.7.8")
+    provider.list_records()
+    assert [call[0][0] for call in provider._session.request.call_args_list] == [
+        "PATCH",
+        "GET",
+    ]
+
+
+def test_records_cache_is_reset_after_a_failed_patch(make_provider):
+    """Tests that a PATCH failing to complete drops the cached records too."""
+    provider = make_provider(RECORDS)
+    provider._session.request.side_effect = requests.ConnectionError()
+
+    with pytest.raises(requests.ConnectionError):
+        provider.create_record("A", "new", "5.6.7.8")
+
+    assert provider._records_cache is None
+
+
+def test_invalid_cache_ttl_should_fail(make_provider):
+    """Tests that a cache_ttl which is not a number of seconds is reported clearly."""
+    with pytest.raises(LexiconError, match="cache_ttl"):
+        make_provider(RECORDS, cache_ttl="soon")